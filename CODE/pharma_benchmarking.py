@@ -6,6 +6,16 @@ from plotly.subplots import make_subplots
 import numpy as np
 from datetime import datetime
 
+import pharma_charts
+from pharma_charts import (
+    COLOR_SCHEME, DEFAULT_DATA_FILE, chart_template, compute_kpis,
+    price_by_material_type, price_vs_benchmark, price_vs_benchmark_data, price_vs_deviation,
+    vendor_offerings, vendor_offerings_data, vendor_prices, vendor_prices_data,
+    vendor_gmp, vendor_gmp_data, price_trends, price_trends_data,
+    price_by_currency, portal_status, portal_status_data, supplier_portals, supplier_portals_data,
+    internal_vs_external, internal_vs_external_data, form_prices, form_prices_data,
+)
+
 # Set page configuration with enhanced theme
 st.set_page_config(
     page_title="Pharmaceutical Price Benchmarking Dashboard",
@@ -62,47 +72,10 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Color scheme
-COLOR_SCHEME = {
-    'primary': '#1f77b4',
-    'secondary': '#ff7f0e',
-    'tertiary': '#2ca02c',
-    'quaternary': '#d62728',
-    'quinary': '#9467bd',
-    'background': '#f8f9fa',
-    'text': '#333333'
-}
-
-# Custom color sequences for charts
-CUSTOM_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', 
-                '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
-
 # Load data
 @st.cache_data
 def load_data():
-    # Read the Excel file
-    data = pd.read_excel('pharma_price_benchmarking_completed_final.xlsx', sheet_name='in')
-    
-    # Clean and convert data
-    # Convert price deviation if it's a string
-    if data['Price_Deviation (%)'].dtype == 'object':
-        data['Price_Deviation (%)'] = data['Price_Deviation (%)'].str.replace('%', '').astype(float)
-    else:
-        data['Price_Deviation (%)'] = data['Price_Deviation (%)'].astype(float)
-    
-    # Convert timestamp columns
-    date_columns = ['Price_Source_Timestamp', 'Internal_Inventory_Date', 'Internal_Contract_Date']
-    for col in date_columns:
-        if col in data.columns:
-            data[col] = pd.to_datetime(data[col], errors='coerce')
-    
-    # Clean percentage columns
-    percentage_cols = ['Portal_vs_Unit_Deviation (%)', 'Inventory_vs_Latest (%)', 'Contract_vs_Latest (%)']
-    for col in percentage_cols:
-        if col in data.columns and data[col].dtype == 'object':
-            data[col] = data[col].str.replace('%', '').astype(float)
-    
-    return data
+    return pharma_charts.load_data(DEFAULT_DATA_FILE)
 
 df = load_data()
 
@@ -195,20 +168,20 @@ if selected_internal_external != 'All':
 
 # Enhanced Key metrics with gradient cards
 st.subheader("📊 Key Performance Indicators")
+kpis = compute_kpis(filtered_df)
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     st.markdown(f"""
     <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
                 padding: 1rem; border-radius: 10px; color: white; text-align: center;'>
-        <h3 style='margin: 0; font-size: 1.5rem;'>{len(filtered_df['Material_Name'].unique()):,}</h3>
+        <h3 style='margin: 0; font-size: 1.5rem;'>{kpis['materials']:,}</h3>
         <p style='margin: 0; opacity: 0.9;'>Total Materials</p>
     </div>
     """, unsafe_allow_html=True)
 
 with col2:
-    avg_price = filtered_df['Unit_Price_Latest'].mean()
-    price_display = f"${avg_price:,.2f}" if pd.notna(avg_price) else "N/A"
+    price_display = f"${kpis['avg_price']:,.2f}" if pd.notna(kpis['avg_price']) else "N/A"
     st.markdown(f"""
     <div style='background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
                 padding: 1rem; border-radius: 10px; color: white; text-align: center;'>
@@ -218,8 +191,7 @@ with col2:
     """, unsafe_allow_html=True)
 
 with col3:
-    avg_deviation = filtered_df['Price_Deviation (%)'].mean()
-    deviation_display = f"{avg_deviation:.2f}%" if pd.notna(avg_deviation) else "N/A"
+    deviation_display = f"{kpis['avg_deviation']:.2f}%" if pd.notna(kpis['avg_deviation']) else "N/A"
     st.markdown(f"""
     <div style='background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); 
                 padding: 1rem; border-radius: 10px; color: white; text-align: center;'>
@@ -229,14 +201,11 @@ with col3:
     """, unsafe_allow_html=True)
 
 with col4:
-    gmp_compliant = filtered_df[filtered_df['GMP_Compliance'] == 'Yes'].shape[0]
-    total_materials = len(filtered_df)
-    compliance_rate = (gmp_compliant/total_materials * 100) if total_materials > 0 else 0
     st.markdown(f"""
     <div style='background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%); 
                 padding: 1rem; border-radius: 10px; color: white; text-align: center;'>
-        <h3 style='margin: 0; font-size: 1.5rem;'>{gmp_compliant}/{total_materials}</h3>
-        <p style='margin: 0; opacity: 0.9;'>GMP Compliant ({compliance_rate:.1f}%)</p>
+        <h3 style='margin: 0; font-size: 1.5rem;'>{kpis['gmp_compliant']}/{kpis['total']}</h3>
+        <p style='margin: 0; opacity: 0.9;'>GMP Compliant ({kpis['compliance_rate']:.1f}%)</p>
     </div>
     """, unsafe_allow_html=True)
 
@@ -250,16 +219,6 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "🔍 Detailed Data"
 ])
 
-# Custom chart template
-chart_template = go.layout.Template(
-    layout=go.Layout(
-        plot_bgcolor='rgba(248,249,250,1)',
-        paper_bgcolor='rgba(248,249,250,1)',
-        font=dict(color=COLOR_SCHEME['text']),
-        colorway=CUSTOM_COLORS
-    )
-)
-
 with tab1:
     st.subheader("🎯 Price Distribution Analysis")
     
@@ -267,11 +226,7 @@ with tab1:
     
     with col1:
         # Enhanced Price distribution by material type
-        fig = px.box(filtered_df, x='Material_Type', y='Unit_Price_Latest', 
-                     title='📦 Price Distribution by Material Type',
-                     color='Material_Type',
-                     color_discrete_sequence=CUSTOM_COLORS)
-        fig.update_layout(template=chart_template)
+        fig = price_by_material_type(filtered_df)
         st.plotly_chart(fig, use_container_width=True)
         
         st.info("""
@@ -281,19 +236,7 @@ with tab1:
     
     with col2:
         # Enhanced Price vs Benchmark comparison
-        avg_prices = filtered_df.groupby('Material_Name').agg({
-            'Unit_Price_Latest': 'mean',
-            'Benchmark_Price': 'mean'
-        }).reset_index().melt(id_vars='Material_Name', 
-                              value_vars=['Unit_Price_Latest', 'Benchmark_Price'],
-                              var_name='Price_Type', value_name='Price')
-        
-        fig = px.bar(avg_prices.head(20), x='Material_Name', y='Price', color='Price_Type',
-                     barmode='group', 
-                     title='⚖️ Average Price vs Benchmark Price (Top 20 Materials)',
-                     color_discrete_sequence=[COLOR_SCHEME['primary'], COLOR_SCHEME['secondary']])
-        fig.update_xaxes(tickangle=45)
-        fig.update_layout(template=chart_template)
+        fig = price_vs_benchmark(price_vs_benchmark_data(filtered_df))
         st.plotly_chart(fig, use_container_width=True)
         
         st.info("""
@@ -304,12 +247,7 @@ with tab1:
     # Enhanced Price deviation analysis
     st.subheader("📊 Price Deviation Analysis")
     
-    fig = px.scatter(filtered_df, x='Unit_Price_Latest', y='Price_Deviation (%)',
-                     color='Material_Type', size='Unit_Price_Latest',
-                     hover_data=['Material_Name', 'Vendor_Name'],
-                     title='🎯 Price vs Deviation Analysis',
-                     color_discrete_sequence=CUSTOM_COLORS)
-    fig.update_layout(template=chart_template)
+    fig = price_vs_deviation(filtered_df)
     st.plotly_chart(fig, use_container_width=True)
     
     st.info("""
@@ -324,12 +262,7 @@ with tab2:
     
     with col1:
         # Enhanced Vendor count by material type
-        vendor_counts = filtered_df.groupby(['Vendor_Name', 'Material_Type']).size().reset_index(name='Count')
-        fig = px.bar(vendor_counts, x='Vendor_Name', y='Count', color='Material_Type',
-                     title='📊 Vendor Offerings by Material Type',
-                     color_discrete_sequence=CUSTOM_COLORS)
-        fig.update_xaxes(tickangle=45)
-        fig.update_layout(template=chart_template)
+        fig = vendor_offerings(vendor_offerings_data(filtered_df))
         st.plotly_chart(fig, use_container_width=True)
         
         st.info("""
@@ -339,15 +272,7 @@ with tab2:
     
     with col2:
         # Enhanced Average price by vendor
-        vendor_prices = filtered_df.groupby('Vendor_Name')['Unit_Price_Latest'].mean().reset_index()
-        vendor_prices = vendor_prices.sort_values('Unit_Price_Latest', ascending=False).head(15)
-        
-        fig = px.bar(vendor_prices, x='Unit_Price_Latest', y='Vendor_Name', 
-                     title='💰 Average Price by Vendor (Top 15)',
-                     orientation='h',
-                     color='Unit_Price_Latest',
-                     color_continuous_scale='Viridis')
-        fig.update_layout(template=chart_template)
+        fig = vendor_prices(vendor_prices_data(filtered_df))
         st.plotly_chart(fig, use_container_width=True)
         
         st.info("""
@@ -358,16 +283,7 @@ with tab2:
     # Enhanced Vendor GMP compliance
     st.subheader("✅ Vendor GMP Compliance Status")
     
-    gmp_stats = filtered_df.groupby('Vendor_Name')['GMP_Compliance'].apply(
-        lambda x: (x == 'Yes').sum() / len(x) * 100
-    ).reset_index(name='GMP_Compliance_Percentage')
-    
-    fig = px.bar(gmp_stats.head(15), x='Vendor_Name', y='GMP_Compliance_Percentage',
-                 title='🛡️ GMP Compliance Rate by Vendor (Top 15)',
-                 color='GMP_Compliance_Percentage',
-                 color_continuous_scale='Greens')
-    fig.update_xaxes(tickangle=45)
-    fig.update_layout(template=chart_template)
+    fig = vendor_gmp(vendor_gmp_data(filtered_df))
     st.plotly_chart(fig, use_container_width=True)
     
     st.info("""
@@ -445,41 +361,7 @@ with tab4:
     
     # Enhanced Time-based analysis
     if not filtered_df['Price_Source_Timestamp'].isnull().all():
-        time_series = filtered_df.groupby('Price_Source_Timestamp').agg({
-            'Unit_Price_Latest': 'mean',
-            'Material_Name': 'count'
-        }).reset_index().rename(columns={'Material_Name': 'Material_Count'})
-        
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
-        
-        # Add price trace
-        fig.add_trace(
-            go.Scatter(x=time_series['Price_Source_Timestamp'], 
-                      y=time_series['Unit_Price_Latest'], 
-                      name="Average Price", 
-                      mode='lines+markers',
-                      line=dict(color=COLOR_SCHEME['primary'], width=3)),
-            secondary_y=False,
-        )
-        
-        # Add count trace
-        fig.add_trace(
-            go.Bar(x=time_series['Price_Source_Timestamp'], 
-                  y=time_series['Material_Count'], 
-                  name="Material Count", 
-                  opacity=0.7,
-                  marker_color=COLOR_SCHEME['secondary']),
-            secondary_y=True,
-        )
-        
-        fig.update_layout(
-            title_text="📈 Price Trends Over Time with Material Count",
-            template=chart_template
-        )
-        
-        fig.update_xaxes(title_text="Date")
-        fig.update_yaxes(title_text="Average Price", secondary_y=False)
-        fig.update_yaxes(title_text="Material Count", secondary_y=True)
+        fig = price_trends(price_trends_data(filtered_df))
         
         st.plotly_chart(fig, use_container_width=True)
         
@@ -497,11 +379,7 @@ with tab5:
     
     with col1:
         # Enhanced Price distribution by currency
-        fig = px.box(filtered_df, x='Currency', y='Unit_Price_Latest', 
-                     title='💵 Price Distribution by Currency',
-                     color='Currency',
-                     color_discrete_sequence=CUSTOM_COLORS)
-        fig.update_layout(template=chart_template)
+        fig = price_by_currency(filtered_df)
         st.plotly_chart(fig, use_container_width=True)
         
         st.info("""
@@ -511,13 +389,7 @@ with tab5:
     
     with col2:
         # Enhanced Portal validation status
-        portal_status = filtered_df['Portal_Validation_Status'].value_counts().reset_index()
-        portal_status.columns = ['Status', 'Count']
-        
-        fig = px.pie(portal_status, values='Count', names='Status',
-                     title='✅ Portal Validation Status',
-                     color_discrete_sequence=CUSTOM_COLORS)
-        fig.update_layout(template=chart_template)
+        fig = portal_status(portal_status_data(filtered_df))
         st.plotly_chart(fig, use_container_width=True)
         
         st.info("""
@@ -528,14 +400,7 @@ with tab5:
     # Enhanced Supplier portal analysis
     st.subheader("🖥️ Supplier Portal Analysis")
     
-    portal_counts = filtered_df['Supplier_Portal_Name'].value_counts().reset_index()
-    portal_counts.columns = ['Portal', 'Count']
-    
-    fig = px.bar(portal_counts, x='Portal', y='Count',
-                 title='📊 Material Count by Supplier Portal',
-                 color='Count',
-                 color_continuous_scale='Purples')
-    fig.update_layout(template=chart_template)
+    fig = supplier_portals(supplier_portals_data(filtered_df))
     st.plotly_chart(fig, use_container_width=True)
     
     st.info("""
@@ -594,28 +459,16 @@ col1, col2 = st.columns(2)
 with col1:
     # Enhanced Internal vs External pricing comparison
     if 'Internal vs External' in filtered_df.columns:
-        internal_comparison = filtered_df.groupby('Internal vs External').agg({
-            'Unit_Price_Latest': 'mean',
-            'Benchmark_Price': 'mean'
-        }).reset_index()
+        internal_comparison = internal_vs_external_data(filtered_df)
         
         if len(internal_comparison) > 1:
-            fig = px.bar(internal_comparison, x='Internal vs External', 
-                        y=['Unit_Price_Latest', 'Benchmark_Price'],
-                        title='🏢 Internal vs External Price Comparison',
-                        barmode='group',
-                        color_discrete_sequence=[COLOR_SCHEME['primary'], COLOR_SCHEME['secondary']])
-            fig.update_layout(template=chart_template)
+            fig = internal_vs_external(internal_comparison)
             st.plotly_chart(fig, use_container_width=True)
 
 with col2:
     # Enhanced Form analysis
     if 'Form' in filtered_df.columns:
-        form_prices = filtered_df.groupby('Form')['Unit_Price_Latest'].mean().reset_index()
-        fig = px.pie(form_prices, values='Unit_Price_Latest', names='Form',
-                    title='🧪 Price Distribution by Material Form',
-                    color_discrete_sequence=CUSTOM_COLORS)
-        fig.update_layout(template=chart_template)
+        fig = form_prices(form_prices_data(filtered_df))
         st.plotly_chart(fig, use_container_width=True)
 
 # Enhanced Footer with gradient
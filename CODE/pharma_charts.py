@@ -0,0 +1,287 @@
+"""Data loading and chart builders shared by the dashboard and the batch reports.
+
+Nothing in here imports Streamlit, so pharma_report.py can render exactly the
+same figures as pharma_benchmarking.py without starting the app.
+"""
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Color scheme
+COLOR_SCHEME = {
+    'primary': '#1f77b4',
+    'secondary': '#ff7f0e',
+    'tertiary': '#2ca02c',
+    'quaternary': '#d62728',
+    'quinary': '#9467bd',
+    'background': '#f8f9fa',
+    'text': '#333333'
+}
+
+# Custom color sequences for charts
+CUSTOM_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+                '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+
+# Custom chart template
+chart_template = go.layout.Template(
+    layout=go.Layout(
+        plot_bgcolor='rgba(248,249,250,1)',
+        paper_bgcolor='rgba(248,249,250,1)',
+        font=dict(color=COLOR_SCHEME['text']),
+        colorway=CUSTOM_COLORS
+    )
+)
+
+DEFAULT_DATA_FILE = 'pharma_price_benchmarking_completed_final.xlsx'
+
+
+def load_data(path=DEFAULT_DATA_FILE):
+    # Read the Excel file
+    data = pd.read_excel(path, sheet_name='in')
+
+    # Clean and convert data
+    # Convert price deviation if it's a string
+    if data['Price_Deviation (%)'].dtype == 'object':
+        data['Price_Deviation (%)'] = data['Price_Deviation (%)'].str.replace('%', '').astype(float)
+    else:
+        data['Price_Deviation (%)'] = data['Price_Deviation (%)'].astype(float)
+
+    # Convert timestamp columns
+    date_columns = ['Price_Source_Timestamp', 'Internal_Inventory_Date', 'Internal_Contract_Date']
+    for col in date_columns:
+        if col in data.columns:
+            data[col] = pd.to_datetime(data[col], errors='coerce')
+
+    # Clean percentage columns
+    percentage_cols = ['Portal_vs_Unit_Deviation (%)', 'Inventory_vs_Latest (%)', 'Contract_vs_Latest (%)']
+    for col in percentage_cols:
+        if col in data.columns and data[col].dtype == 'object':
+            data[col] = data[col].str.replace('%', '').astype(float)
+
+    return data
+
+
+def compute_kpis(filtered_df):
+    gmp_compliant = filtered_df[filtered_df['GMP_Compliance'] == 'Yes'].shape[0]
+    total_materials = len(filtered_df)
+    return {
+        'materials': len(filtered_df['Material_Name'].unique()),
+        'avg_price': filtered_df['Unit_Price_Latest'].mean(),
+        'avg_deviation': filtered_df['Price_Deviation (%)'].mean(),
+        'gmp_compliant': gmp_compliant,
+        'total': total_materials,
+        'compliance_rate': (gmp_compliant/total_materials * 100) if total_materials > 0 else 0,
+    }
+
+
+# Aggregations behind the dashboard figures. Charts that plot individual rows
+# (box and scatter plots) take the filtered frame directly.
+def price_vs_benchmark_data(filtered_df):
+    avg_prices = filtered_df.groupby('Material_Name').agg({
+        'Unit_Price_Latest': 'mean',
+        'Benchmark_Price': 'mean'
+    }).reset_index().melt(id_vars='Material_Name',
+                          value_vars=['Unit_Price_Latest', 'Benchmark_Price'],
+                          var_name='Price_Type', value_name='Price')
+    return avg_prices.head(20)
+
+
+def vendor_offerings_data(filtered_df):
+    return filtered_df.groupby(['Vendor_Name', 'Material_Type']).size().reset_index(name='Count')
+
+
+def vendor_prices_data(filtered_df):
+    vendor_prices = filtered_df.groupby('Vendor_Name')['Unit_Price_Latest'].mean().reset_index()
+    return vendor_prices.sort_values('Unit_Price_Latest', ascending=False).head(15)
+
+
+def vendor_gmp_data(filtered_df):
+    gmp_stats = filtered_df.groupby('Vendor_Name')['GMP_Compliance'].apply(
+        lambda x: (x == 'Yes').sum() / len(x) * 100
+    ).reset_index(name='GMP_Compliance_Percentage')
+    return gmp_stats.head(15)
+
+
+def price_trends_data(filtered_df):
+    return filtered_df.groupby('Price_Source_Timestamp').agg({
+        'Unit_Price_Latest': 'mean',
+        'Material_Name': 'count'
+    }).reset_index().rename(columns={'Material_Name': 'Material_Count'})
+
+
+def portal_status_data(filtered_df):
+    portal_status = filtered_df['Portal_Validation_Status'].value_counts().reset_index()
+    portal_status.columns = ['Status', 'Count']
+    return portal_status
+
+
+def supplier_portals_data(filtered_df):
+    portal_counts = filtered_df['Supplier_Portal_Name'].value_counts().reset_index()
+    portal_counts.columns = ['Portal', 'Count']
+    return portal_counts
+
+
+def internal_vs_external_data(filtered_df):
+    return filtered_df.groupby('Internal vs External').agg({
+        'Unit_Price_Latest': 'mean',
+        'Benchmark_Price': 'mean'
+    }).reset_index()
+
+
+def form_prices_data(filtered_df):
+    return filtered_df.groupby('Form')['Unit_Price_Latest'].mean().reset_index()
+
+
+# Chart builders, one per dashboard figure. Kept at module level so the batch
+# reports can look them up by name inside worker processes.
+def price_by_material_type(data):
+    fig = px.box(data, x='Material_Type', y='Unit_Price_Latest',
+                 title='📦 Price Distribution by Material Type',
+                 color='Material_Type',
+                 color_discrete_sequence=CUSTOM_COLORS)
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def price_vs_benchmark(data):
+    fig = px.bar(data, x='Material_Name', y='Price', color='Price_Type',
+                 barmode='group',
+                 title='⚖️ Average Price vs Benchmark Price (Top 20 Materials)',
+                 color_discrete_sequence=[COLOR_SCHEME['primary'], COLOR_SCHEME['secondary']])
+    fig.update_xaxes(tickangle=45)
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def price_vs_deviation(data):
+    fig = px.scatter(data, x='Unit_Price_Latest', y='Price_Deviation (%)',
+                     color='Material_Type', size='Unit_Price_Latest',
+                     hover_data=['Material_Name', 'Vendor_Name'],
+                     title='🎯 Price vs Deviation Analysis',
+                     color_discrete_sequence=CUSTOM_COLORS)
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def vendor_offerings(data):
+    fig = px.bar(data, x='Vendor_Name', y='Count', color='Material_Type',
+                 title='📊 Vendor Offerings by Material Type',
+                 color_discrete_sequence=CUSTOM_COLORS)
+    fig.update_xaxes(tickangle=45)
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def vendor_prices(data):
+    fig = px.bar(data, x='Unit_Price_Latest', y='Vendor_Name',
+                 title='💰 Average Price by Vendor (Top 15)',
+                 orientation='h',
+                 color='Unit_Price_Latest',
+                 color_continuous_scale='Viridis')
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def vendor_gmp(data):
+    fig = px.bar(data, x='Vendor_Name', y='GMP_Compliance_Percentage',
+                 title='🛡️ GMP Compliance Rate by Vendor (Top 15)',
+                 color='GMP_Compliance_Percentage',
+                 color_continuous_scale='Greens')
+    fig.update_xaxes(tickangle=45)
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def price_trends(data):
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    # Add price trace
+    fig.add_trace(
+        go.Scatter(x=data['Price_Source_Timestamp'],
+                  y=data['Unit_Price_Latest'],
+                  name="Average Price",
+                  mode='lines+markers',
+                  line=dict(color=COLOR_SCHEME['primary'], width=3)),
+        secondary_y=False,
+    )
+
+    # Add count trace
+    fig.add_trace(
+        go.Bar(x=data['Price_Source_Timestamp'],
+              y=data['Material_Count'],
+              name="Material Count",
+              opacity=0.7,
+              marker_color=COLOR_SCHEME['secondary']),
+        secondary_y=True,
+    )
+
+    fig.update_layout(
+        title_text="📈 Price Trends Over Time with Material Count",
+        template=chart_template
+    )
+
+    fig.update_xaxes(title_text="Date")
+    fig.update_yaxes(title_text="Average Price", secondary_y=False)
+    fig.update_yaxes(title_text="Material Count", secondary_y=True)
+    return fig
+
+
+def price_by_currency(data):
+    fig = px.box(data, x='Currency', y='Unit_Price_Latest',
+                 title='💵 Price Distribution by Currency',
+                 color='Currency',
+                 color_discrete_sequence=CUSTOM_COLORS)
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def portal_status(data):
+    fig = px.pie(data, values='Count', names='Status',
+                 title='✅ Portal Validation Status',
+                 color_discrete_sequence=CUSTOM_COLORS)
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def supplier_portals(data):
+    fig = px.bar(data, x='Portal', y='Count',
+                 title='📊 Material Count by Supplier Portal',
+                 color='Count',
+                 color_continuous_scale='Purples')
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def internal_vs_external(data):
+    fig = px.bar(data, x='Internal vs External',
+                 y=['Unit_Price_Latest', 'Benchmark_Price'],
+                 title='🏢 Internal vs External Price Comparison',
+                 barmode='group',
+                 color_discrete_sequence=[COLOR_SCHEME['primary'], COLOR_SCHEME['secondary']])
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+def form_prices(data):
+    fig = px.pie(data, values='Unit_Price_Latest', names='Form',
+                 title='🧪 Price Distribution by Material Form',
+                 color_discrete_sequence=CUSTOM_COLORS)
+    fig.update_layout(template=chart_template)
+    return fig
+
+
+CHART_BUILDERS = {
+    'price_by_material_type': price_by_material_type,
+    'price_vs_benchmark': price_vs_benchmark,
+    'price_vs_deviation': price_vs_deviation,
+    'vendor_offerings': vendor_offerings,
+    'vendor_prices': vendor_prices,
+    'vendor_gmp': vendor_gmp,
+    'price_trends': price_trends,
+    'price_by_currency': price_by_currency,
+    'portal_status': portal_status,
+    'supplier_portals': supplier_portals,
+    'internal_vs_external': internal_vs_external,
+    'form_prices': form_prices,
+}
@@ -0,0 +1,311 @@
+"""Batch report mode for the Pharmaceutical Price Benchmarking Dashboard.
+
+Renders a list of filter presets into static, self-contained HTML (and
+optionally PNG) reports so the recurring weekly views can be distributed
+without loading the live Streamlit app.
+
+Usage:
+    python pharma_report.py --presets report_presets.json --output reports
+    python pharma_report.py --presets report_presets.json --format html --format png
+"""
+import argparse
+import html
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from pharma_charts import (
+    CHART_BUILDERS, COLOR_SCHEME, DEFAULT_DATA_FILE, compute_kpis, load_data,
+    form_prices_data, internal_vs_external_data, portal_status_data, price_trends_data,
+    price_vs_benchmark_data, supplier_portals_data, vendor_gmp_data, vendor_offerings_data,
+    vendor_prices_data,
+)
+
+# Preset keys mapped to the dashboard filter columns and their labels
+FILTER_COLUMNS = {
+    'material_type': ('Material_Type', 'Material'),
+    'vendor': ('Vendor_Name', 'Vendor'),
+    'gmp': ('GMP_Compliance', 'GMP'),
+    'price_tier': ('Price_Tier', 'Price Tier'),
+    'currency': ('Currency', 'Currency'),
+    'internal_external': ('Internal vs External', 'Type'),
+}
+
+
+def load_presets(path):
+    # A presets file is a JSON list of {"name": ..., <filter key>: <value(s)>, ...}
+    with open(path, encoding='utf-8') as fh:
+        presets = json.load(fh)
+    if not isinstance(presets, list) or not presets:
+        raise ValueError(f"{path}: expected a non-empty JSON list of presets")
+
+    seen = set()
+    for preset in presets:
+        if not isinstance(preset, dict) or not preset.get('name'):
+            raise ValueError(f"{path}: every preset needs a 'name'")
+        unknown = set(preset) - set(FILTER_COLUMNS) - {'name'}
+        if unknown:
+            raise ValueError(f"{path}: preset '{preset['name']}' has unknown filters: "
+                             f"{', '.join(sorted(unknown))}")
+        slug = slugify(preset['name'])
+        if slug in seen:
+            raise ValueError(f"{path}: duplicate preset name '{preset['name']}'")
+        seen.add(slug)
+    return presets
+
+
+def slugify(name):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(name)).strip('-').lower() or 'preset'
+
+
+def preset_filters(preset):
+    # Normalised (column, values) pairs, skipping 'All' like the dashboard does.
+    # A filter may list several values, e.g. both spellings of a price tier.
+    filters = []
+    for key, value in preset.items():
+        if key not in FILTER_COLUMNS:
+            continue
+        values = value if isinstance(value, list) else [value]
+        if not values or any(v in (None, 'All') for v in values):
+            continue
+        filters.append((FILTER_COLUMNS[key][0], tuple(sorted(str(v) for v in values))))
+    return tuple(sorted(filters))
+
+
+def check_preset_values(df, presets):
+    # Fail loudly on values that match nothing, instead of rendering an empty report
+    for preset in presets:
+        for col, values in preset_filters(preset):
+            known = set(df[col].dropna().astype(str).unique())
+            unknown = [v for v in values if v not in known]
+            if unknown:
+                raise ValueError(f"preset '{preset['name']}': unknown {col} value(s) "
+                                 f"{', '.join(repr(v) for v in unknown)}; "
+                                 f"expected one of: {', '.join(sorted(known))}")
+
+
+def apply_filters(df, filters):
+    mask = pd.Series(True, index=df.index)
+    for col, values in filters:
+        mask &= df[col].astype(str).isin(values)
+    return df[mask]
+
+
+def aggregate(filtered_df):
+    # Pre-compute the (small) frames each chart needs, so workers only receive
+    # what they plot instead of the full dataset.
+    charts = {}
+    if filtered_df.empty:
+        return charts
+
+    charts['price_by_material_type'] = filtered_df[['Material_Type', 'Unit_Price_Latest']]
+    charts['price_vs_benchmark'] = price_vs_benchmark_data(filtered_df)
+    charts['price_vs_deviation'] = filtered_df[['Unit_Price_Latest', 'Price_Deviation (%)',
+                                                'Material_Type', 'Material_Name', 'Vendor_Name']]
+    charts['vendor_offerings'] = vendor_offerings_data(filtered_df)
+    charts['vendor_prices'] = vendor_prices_data(filtered_df)
+    charts['vendor_gmp'] = vendor_gmp_data(filtered_df)
+    if not filtered_df['Price_Source_Timestamp'].isnull().all():
+        charts['price_trends'] = price_trends_data(filtered_df)
+    charts['price_by_currency'] = filtered_df[['Currency', 'Unit_Price_Latest']]
+    charts['portal_status'] = portal_status_data(filtered_df)
+    charts['supplier_portals'] = supplier_portals_data(filtered_df)
+
+    if 'Internal vs External' in filtered_df.columns:
+        internal_comparison = internal_vs_external_data(filtered_df)
+        if len(internal_comparison) > 1:
+            charts['internal_vs_external'] = internal_comparison
+    if 'Form' in filtered_df.columns:
+        charts['form_prices'] = form_prices_data(filtered_df)
+
+    return charts
+
+
+# Report sections in display order
+SECTIONS = [
+    ('📈 Price Analysis', ['price_by_material_type', 'price_vs_benchmark', 'price_vs_deviation']),
+    ('🏭 Vendor Analysis', ['vendor_offerings', 'vendor_prices', 'vendor_gmp']),
+    ('📅 Temporal Analysis', ['price_trends']),
+    ('🌐 Currency & Portal Analysis', ['price_by_currency', 'portal_status', 'supplier_portals']),
+    ('📋 Additional Benchmarking Analysis', ['internal_vs_external', 'form_prices']),
+]
+
+
+def render_chart(slug, key, data, png_dir, want_html):
+    # Runs in a worker process: build the figure and serialise it
+    fig = CHART_BUILDERS[key](data)
+
+    png_path = None
+    if png_dir is not None:
+        png_path = os.path.join(png_dir, f"{key}.png")
+        fig.write_image(png_path, width=1200, height=600)
+
+    div = None
+    if want_html:
+        div = fig.to_html(full_html=False, include_plotlyjs=False, div_id=f"{slug}-{key}")
+    return slug, key, div, png_path
+
+
+def kpi_cards(kpis):
+    price_display = f"${kpis['avg_price']:,.2f}" if pd.notna(kpis['avg_price']) else "N/A"
+    deviation_display = f"{kpis['avg_deviation']:.2f}%" if pd.notna(kpis['avg_deviation']) else "N/A"
+    cards = [
+        ('#667eea 0%, #764ba2 100%', f"{kpis['materials']:,}", 'Total Materials'),
+        ('#f093fb 0%, #f5576c 100%', price_display, 'Average Price'),
+        ('#4facfe 0%, #00f2fe 100%', deviation_display, 'Avg Price Deviation'),
+        ('#43e97b 0%, #38f9d7 100%', f"{kpis['gmp_compliant']}/{kpis['total']}",
+         f"GMP Compliant ({kpis['compliance_rate']:.1f}%)"),
+    ]
+    return "\n".join(f"""
+        <div style='flex: 1; background: linear-gradient(135deg, {gradient});
+                    padding: 1rem; border-radius: 10px; color: white; text-align: center;'>
+            <h3 style='margin: 0; font-size: 1.5rem;'>{value}</h3>
+            <p style='margin: 0; opacity: 0.9;'>{label}</p>
+        </div>""" for gradient, value, label in cards)
+
+
+def build_page(preset, filters, kpis, divs, generated_at, plotlyjs):
+    labels = {col: label for col, label in FILTER_COLUMNS.values()}
+    active_filters = [f"{labels[col]}: {html.escape(', '.join(values))}" for col, values in filters]
+    filter_summary = ("<ul>" + "".join(f"<li>{f}</li>" for f in active_filters) + "</ul>"
+                      if active_filters else "<p>No filters applied (all records).</p>")
+
+    body = []
+    for title, keys in SECTIONS:
+        section_divs = [divs[key] for key in keys if key in divs]
+        if section_divs:
+            body.append(f"<h2>{title}</h2>")
+            body.extend(f"<div class='chart'>{div}</div>" for div in section_divs)
+    if not body:
+        body.append("<p>⚠️ No records match this preset.</p>")
+
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{html.escape(preset['name'])} - Pharmaceutical Price Benchmarking</title>
+<script type="text/javascript">{plotlyjs}</script>
+<style>
+    body {{ font-family: sans-serif; color: {COLOR_SCHEME['text']}; margin: 1rem 2rem; }}
+    .chart {{ margin-bottom: 1.5rem; }}
+</style>
+</head>
+<body>
+<div style='background: linear-gradient(135deg, {COLOR_SCHEME["primary"]} 0%, {COLOR_SCHEME["quinary"]} 100%);
+            padding: 2rem; border-radius: 15px; color: white; text-align: center; margin-bottom: 2rem;'>
+    <h1 style='margin: 0; font-size: 2.5rem;'>💊 Pharmaceutical Price Benchmarking Report</h1>
+    <p style='margin: 0.5rem 0 0 0; font-size: 1.1rem; opacity: 0.9;'>{html.escape(preset['name'])}</p>
+</div>
+<h2>🔍 Filters</h2>
+{filter_summary}
+<h2>📊 Key Performance Indicators</h2>
+<div style='display: flex; gap: 1rem;'>
+{kpi_cards(kpis)}
+</div>
+{chr(10).join(body)}
+<div style='background-color: {COLOR_SCHEME["background"]}; padding: 1rem; border-radius: 5px; text-align: center;'>
+    <small>📅 Report generated: {generated_at}</small>
+</div>
+</body>
+</html>
+"""
+
+
+def generate_reports(df, presets, output_dir, formats, workers=None):
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Single aggregate pass over all presets; presets that resolve to the same
+    # filters share one set of aggregates.
+    aggregates = {}
+    reports = []
+    for preset in presets:
+        filters = preset_filters(preset)
+        if filters not in aggregates:
+            filtered_df = apply_filters(df, filters)
+            aggregates[filters] = (compute_kpis(filtered_df), aggregate(filtered_df))
+        reports.append((slugify(preset['name']), preset, filters))
+
+    # Figures are built and rendered in parallel worker processes
+    divs = {slug: {} for slug, _, _ in reports}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for slug, _, filters in reports:
+            png_dir = None
+            if 'png' in formats:
+                png_dir = os.path.join(output_dir, slug)
+                os.makedirs(png_dir, exist_ok=True)
+            for key, data in aggregates[filters][1].items():
+                futures.append(executor.submit(render_chart, slug, key, data, png_dir,
+                                               'html' in formats))
+        for future in futures:
+            slug, key, div, _ = future.result()
+            divs[slug][key] = div
+
+    written = []
+    if 'html' in formats:
+        generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        plotlyjs = get_plotlyjs()
+        for slug, preset, filters in reports:
+            path = os.path.join(output_dir, f"{slug}.html")
+            page = build_page(preset, filters, aggregates[filters][0], divs[slug], generated_at, plotlyjs)
+            with open(path, 'w', encoding='utf-8') as fh:
+                fh.write(page)
+            written.append(path)
+    if 'png' in formats:
+        written.extend(os.path.join(output_dir, slug) + os.sep for slug, _, _ in reports)
+    return written
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render filter presets of the benchmarking dashboard into static reports.")
+    parser.add_argument('--presets', required=True,
+                        help="JSON file with the list of filter presets to render")
+    parser.add_argument('--data', default=DEFAULT_DATA_FILE,
+                        help=f"benchmarking workbook to read (default: {DEFAULT_DATA_FILE})")
+    parser.add_argument('--output', default='reports',
+                        help="directory to write the reports to (default: reports)")
+    parser.add_argument('--format', dest='formats', action='append', choices=['html', 'png'],
+                        help="output format, may be repeated (default: html)")
+    parser.add_argument('--workers', type=positive_int, default=None,
+                        help="number of rendering processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    formats = set(args.formats or ['html'])
+
+    if 'png' in formats:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error("PNG output requires the 'kaleido' package (pip install kaleido)")
+
+    try:
+        presets = load_presets(args.presets)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+    try:
+        df = load_data(args.data)
+        check_preset_values(df, presets)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+    for path in generate_reports(df, presets, args.output, formats, args.workers):
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'CODE'))
+
+DATA_FILE = os.path.join(ROOT, 'DATASET', 'pharma_price_benchmarking_completed_final.xlsx')
@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+from conftest import DATA_FILE
+from pharma_charts import compute_kpis, load_data
+from pharma_report import (
+    apply_filters, check_preset_values, generate_reports, load_presets, main, preset_filters,
+)
+
+
+@pytest.fixture(scope='module')
+def df():
+    return load_data(DATA_FILE)
+
+
+def write_presets(tmp_path, presets):
+    path = tmp_path / 'presets.json'
+    path.write_text(json.dumps(presets), encoding='utf-8')
+    return str(path)
+
+
+def test_load_presets_rejects_unknown_filter(tmp_path):
+    path = write_presets(tmp_path, [{'name': 'Typo', 'materal_type': 'Solvent'}])
+    with pytest.raises(ValueError, match='unknown filters: materal_type'):
+        load_presets(path)
+
+
+def test_load_presets_rejects_duplicate_slugs(tmp_path):
+    path = write_presets(tmp_path, [{'name': 'Weekly Report'}, {'name': 'weekly-report'}])
+    with pytest.raises(ValueError, match='duplicate preset name'):
+        load_presets(path)
+
+
+def test_preset_filters_skips_all_and_none():
+    preset = {'name': 'x', 'vendor': 'All', 'gmp': None, 'currency': 'USD',
+              'price_tier': ['high', 'High']}
+    assert preset_filters(preset) == (('Currency', ('USD',)), ('Price_Tier', ('High', 'high')))
+
+
+def test_apply_filters(df):
+    filtered = apply_filters(df, preset_filters({'name': 'x', 'price_tier': ['High', 'high']}))
+    assert len(filtered) == (df['Price_Tier'].isin(['High', 'high'])).sum()
+    assert len(apply_filters(df, ())) == len(df)
+
+
+def test_check_preset_values_rejects_values_missing_from_data(df):
+    check_preset_values(df, [{'name': 'ok', 'material_type': 'Solvent', 'vendor': 'Merck'}])
+    with pytest.raises(ValueError, match="'Solvents'"):
+        check_preset_values(df, [{'name': 'typo', 'material_type': 'Solvents'}])
+    with pytest.raises(ValueError, match="'merck'"):
+        check_preset_values(df, [{'name': 'typo', 'vendor': 'merck'}])
+
+
+def test_compute_kpis_on_empty_frame(df):
+    kpis = compute_kpis(df.iloc[0:0])
+    assert kpis['materials'] == 0
+    assert kpis['total'] == 0
+    assert kpis['compliance_rate'] == 0
+
+
+def test_generate_reports_writes_one_html_per_preset(df, tmp_path):
+    presets = [{'name': 'All Materials'},
+               {'name': 'GMP Solvents', 'material_type': 'Solvent', 'gmp': 'Yes'}]
+    written = generate_reports(df, presets, str(tmp_path), {'html'}, workers=1)
+
+    assert sorted(os.path.basename(p) for p in written) == ['all-materials.html', 'gmp-solvents.html']
+    page = (tmp_path / 'gmp-solvents.html').read_text(encoding='utf-8')
+    assert 'Material: Solvent' in page
+    assert 'gmp-solvents-price_by_material_type' in page
+
+
+def test_main_reports_bad_arguments(tmp_path, capsys):
+    presets = write_presets(tmp_path, [{'name': 'All'}])
+    with pytest.raises(SystemExit):
+        main(['--presets', presets, '--data', DATA_FILE, '--workers', '0'])
+    assert 'must be a positive integer' in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        main(['--presets', presets, '--data', str(tmp_path / 'missing.xlsx')])
+    assert 'missing.xlsx' in capsys.readouterr().err